@@ -3,8 +3,14 @@ import numpy as np
 from datetime import datetime
 from pathlib import Path
 
-# Set random seed for reproducibility
-np.random.seed(42)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# Seeded random generator for reproducibility
+RNG = np.random.default_rng(42)
 
 # Constants for product data
 PRODUCT_CATEGORIES = {
@@ -15,6 +21,18 @@ PRODUCT_CATEGORIES = {
     'Sports': ['Bicycles', 'Treadmills', 'Dumbbells', 'Yoga Mats', 'Sportswear']
 }
 
+# Value range (low, high) for each product category
+CATEGORY_VALUE_RANGES = {
+    'Electronics': (100, 2000),
+    'Furniture': (50, 1500),
+    'Clothing': (10, 200),
+    'Home Appliances': (80, 2500),
+    'Sports': (30, 1200)
+}
+
+# Buffer size for CSV output files, so writes reach the OS in large blocks
+WRITE_BUFFER_SIZE = 1 << 20
+
 STATES_USA = [
     'Alabama', 'Alaska', 'Arizona', 'Arkansas', 'California', 'Colorado', 'Connecticut',
     'Delaware', 'Florida', 'Georgia', 'Hawaii', 'Idaho', 'Illinois', 'Indiana', 'Iowa',
@@ -28,33 +46,26 @@ STATES_USA = [
 
 def generate_product_data(num_products=150):
     """Generate product sales data."""
-    products = []
-
     # Generate product IDs
-    product_ids = [f'P{str(i + 1).zfill(3)}' for i in range(num_products)]
-
-    # Generate categories and subcategories
-    categories = []
-    subcategories = []
-    for _ in range(num_products):
-        category = np.random.choice(list(PRODUCT_CATEGORIES.keys()))
-        subcategory = np.random.choice(PRODUCT_CATEGORIES[category])
-        categories.append(category)
-        subcategories.append(subcategory)
+    product_ids = np.char.add('P', np.char.zfill(np.arange(1, num_products + 1).astype(str), 3))
+
+    # Generate categories and subcategories in one draw per column, as categorical codes
+    category_names = list(PRODUCT_CATEGORIES.keys())
+    subcategory_names = [sub for subs in PRODUCT_CATEGORIES.values() for sub in subs]
+    # Each category's subcategories sit in one contiguous block of subcategory_names
+    sub_counts = np.array([len(subs) for subs in PRODUCT_CATEGORIES.values()])
+    sub_offsets = np.r_[0, np.cumsum(sub_counts)[:-1]]
+    cat_codes = RNG.integers(0, len(category_names), num_products).astype(np.int8)
+    sub_codes = (RNG.uniform(size=num_products) * sub_counts[cat_codes]).astype(int)
+    categories = pd.Categorical.from_codes(cat_codes, categories=category_names)
+    subcategories = pd.Categorical.from_codes(sub_offsets[cat_codes] + sub_codes,
+                                              categories=subcategory_names)
 
     # Generate values with different ranges based on category
-    values = []
-    for cat in categories:
-        if cat == 'Electronics':
-            values.append(round(np.random.uniform(100, 2000), 2))
-        elif cat == 'Furniture':
-            values.append(round(np.random.uniform(50, 1500), 2))
-        elif cat == 'Clothing':
-            values.append(round(np.random.uniform(10, 200), 2))
-        elif cat == 'Home Appliances':
-            values.append(round(np.random.uniform(80, 2500), 2))
-        else:  # Sports
-            values.append(round(np.random.uniform(30, 1200), 2))
+    lows = np.array([CATEGORY_VALUE_RANGES[cat][0] for cat in category_names])
+    highs = np.array([CATEGORY_VALUE_RANGES[cat][1] for cat in category_names])
+    u = RNG.uniform(size=num_products)
+    values = np.round(lows[cat_codes] + u * (highs[cat_codes] - lows[cat_codes]), 2)
 
     # Create DataFrame
     df = pd.DataFrame({
@@ -69,49 +80,31 @@ def generate_product_data(num_products=150):
 
 def generate_sales_summary(start_year=2023, total_months=12, num_states=20):
     """Generate monthly sales summary data."""
-    months = []
-    years = []
-    total_costs = []
-    total_discounts = []
-    order_avgs = []
-    units_sold = []
-    profit_margins = []
-    total_sales = []
-    states = []
-
     # Select random states
-    selected_states = np.random.choice(STATES_USA, size=num_states, replace=False)
-
-    for i in range(total_months):
-        year = start_year + (i // 12)
-        month = (i % 12) + 1
-        for state in selected_states[:num_states]:
-            # Base values with some randomness
-            base_sales = np.random.uniform(50000, 200000)
-            seasonality = 1 + 0.2 * np.sin((month - 1) * np.pi / 6)  # Seasonal pattern
-
-            # Generate metrics
-            total_cost = round(base_sales * np.random.uniform(0.5, 0.8) * seasonality, 2)
-            total_discount = round(total_cost * np.random.uniform(0.01, 0.15), 2)
-            order_avg = round(np.random.uniform(50, 300), 2)
-            units = int(base_sales * np.random.uniform(0.5, 2.0) / order_avg)
-            profit_margin = round(np.random.uniform(0.1, 0.4), 2)
-            sales = round(total_cost / (1 - profit_margin), 2)
-
-            # Add to lists
-            months.append(month)
-            years.append(year)
-            total_costs.append(total_cost)
-            total_discounts.append(total_discount)
-            order_avgs.append(order_avg)
-            units_sold.append(units)
-            profit_margins.append(profit_margin)
-            total_sales.append(sales)
-            states.append(state)
+    selected_states = RNG.choice(STATES_USA, size=num_states, replace=False)
+
+    # One row per (month, state) pair, laid out month-major
+    n = total_months * num_states
+    month_index = np.repeat(np.arange(total_months), num_states)
+    years = start_year + month_index // 12
+    months = month_index % 12 + 1
+    states = np.tile(selected_states, total_months)
+
+    # Base values with some randomness
+    base_sales = RNG.uniform(50000, 200000, n)
+    seasonality = 1 + 0.2 * np.sin((months - 1) * np.pi / 6)  # Seasonal pattern
+
+    # Generate metrics
+    total_costs = np.round(base_sales * RNG.uniform(0.5, 0.8, n) * seasonality, 2)
+    total_discounts = np.round(total_costs * RNG.uniform(0.01, 0.15, n), 2)
+    order_avgs = np.round(RNG.uniform(50, 300, n), 2)
+    units_sold = (base_sales * RNG.uniform(0.5, 2.0, n) / order_avgs).astype(int)
+    profit_margins = np.round(RNG.uniform(0.1, 0.4, n), 2)
+    total_sales = np.round(total_costs / (1 - profit_margins), 2)
 
     # Calculate percentage of promotional vs non-promotional sales
-    promo_percent = [round(np.random.uniform(0.2, 0.6), 2) for _ in range(len(months))]
-    non_promo_percent = [round(1 - p, 2) for p in promo_percent]
+    promo_percent = np.round(RNG.uniform(0.2, 0.6, n), 2)
+    non_promo_percent = np.round(1 - promo_percent, 2)
 
     # Create DataFrame
     df = pd.DataFrame({
@@ -129,16 +122,63 @@ def generate_sales_summary(start_year=2023, total_months=12, num_states=20):
     })
 
     return df
+
+
+def needs_no_quoting(df):
+    """Return True if every column is int, float64, bool or text that CSV would never quote."""
+    if df.isna().any().any():
+        return False
+    for col in df.columns:
+        dtype = df[col].dtype
+        # Only these dtypes print the same under str() as under to_csv (float32 and datetimes do not)
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype) or dtype == np.float64:
+            continue
+        values = df[col].cat.categories if isinstance(dtype, pd.CategoricalDtype) else df[col]
+        if pd.api.types.infer_dtype(values, skipna=False) != 'string':
+            return False
+        if pd.Series(values).astype(str).str.contains(r'[,"\r\n]').any():
+            return False
+    return not any(ch in str(col) for col in df.columns for ch in ',"\r\n')
+
+
+def write_plain_csv(df, f):
+    """Format a frame that needs no quoting into one string and write it in a single call."""
+    row_format = ','.join(['{}'] * len(df.columns))
+    columns = [df[col].tolist() for col in df.columns]
+    lines = [','.join(map(str, df.columns))]
+    lines.extend(row_format.format(*row) for row in zip(*columns))
+    f.write('\n'.join(lines) + '\n')
+
+
+def write_csv(df, path):
+    """Write a DataFrame to CSV with the fastest writer available for its contents."""
+    if pa is not None:
+        # Match the plain writer's unquoted output whenever nothing needs quoting
+        write_options = None
+        if needs_no_quoting(df):
+            write_options = pacsv.WriteOptions(quoting_style='none', quoting_header='none')
+        with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f, write_options=write_options)
+        return
+
+    with open(path, 'w', buffering=WRITE_BUFFER_SIZE, newline='') as f:
+        if needs_no_quoting(df):
+            write_plain_csv(df, f)
+        else:
+            # A default RangeIndex keeps to_csv(index=False) on its fast path
+            df.reset_index(drop=True).to_csv(f, index=False, lineterminator='\n', chunksize=100_000)
+
+
 def save_datasets(products_df, sales_df, output_dir='data'):
     """Save the generated datasets to CSV files."""
-    output_path = '../data'
-    #output_path.mkdir(exist_ok=True)
+    output_path = Path('../data')
+    output_path.mkdir(parents=True, exist_ok=True)
 
-    products_path = output_path + '/products.csv'
-    sales_path = output_path + '/sales_summary.csv'
+    products_path = output_path / 'products.csv'
+    sales_path = output_path / 'sales_summary.csv'
 
-    products_df.to_csv(products_path, index=False)
-    sales_df.to_csv(sales_path, index=False)
+    write_csv(products_df, products_path)
+    write_csv(sales_df, sales_path)
 
     print(f"Datasets saved to:\n- {products_path}\n- {sales_path}")
 
@@ -1,28 +1,163 @@
+import hashlib
+import importlib.metadata
+import importlib.util
+import shutil
+import sys
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from pathlib import Path
 
-
-def create_dashboard():
+# Parse CSVs with pandas' multi-threaded pyarrow engine into Arrow-backed columns
+# when pyarrow is installed, otherwise with the default C engine
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+if HAS_PYARROW:
+    CSV_READ_OPTIONS = dict(engine='pyarrow', dtype_backend='pyarrow')
+else:
+    CSV_READ_OPTIONS = dict(engine='c')
+
+# Columns read from products.csv and their dtypes, so the parser skips type inference
+PRODUCT_DTYPES = {'category': 'category', 'sub_category': 'category', 'value': 'float64'}
+
+# State lookup, prebuilt as a Series so .map uses pandas' index hashing
+US_STATE_TO_ABBREV = {
+    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
+    "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE", "Florida": "FL", "Georgia": "GA",
+    "Hawaii": "HI", "Idaho": "ID", "Illinois": "IL", "Indiana": "IN", "Iowa": "IA",
+    "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
+    "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS",
+    "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV", "New Hampshire": "NH",
+    "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY", "North Carolina": "NC",
+    "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK", "Oregon": "OR", "Pennsylvania": "PA",
+    "Rhode Island": "RI", "South Carolina": "SC", "South Dakota": "SD", "Tennessee": "TN",
+    "Texas": "TX", "Utah": "UT", "Vermont": "VT", "Virginia": "VA", "Washington": "WA",
+    "West Virginia": "WV", "Wisconsin": "WI", "Wyoming": "WY"
+}
+STATE_ABBREV = pd.Series(US_STATE_TO_ABBREV, dtype='string')
+
+# Month abbreviations indexed by month - 1, for vectorized label building
+MONTH_NAMES = np.array(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                        'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], dtype='<U3')
+
+# Color map for the treemap categories
+COLOR_MAP = {
+    'Home Appliances': '#d8d8d8',
+    'Electronics': '#5a6d8b',
+    'Sports': '#66bfc7',
+    'Furniture': '#a14df2',
+    'Clothing': '#3333a6'
+}
+
+# Static layout pieces for the combined dashboard figure, built once at import
+CHART_TITLE_ANNOTATIONS = [
+    dict(
+        text="Map of Sales",
+        y=0.84, x=0.055,  # Centered over the first column
+        xref='paper', yref='paper',
+        font=dict(size=16), showarrow=False, xanchor='center', yanchor='bottom'
+    ),
+    dict(
+        text="Net Revenue by Subcategory",
+        y=0.84, x=0.61,  # Centered over the second column
+        xref='paper', yref='paper',
+        font=dict(size=16), showarrow=False, xanchor='center', yanchor='bottom'
+    ),
+    dict(
+        text="% Net Revenue - <b>Promo</b> vs <b style='color:#62738c'>Non-Promo</b>",
+        y=0.28, x=0.13,  # Centered over the first column
+        xref='paper', yref='paper',
+        font=dict(size=16), showarrow=False, xanchor='center', yanchor='bottom'
+    )
+]
+
+# Treemap category colour key, rendered as HTML over the figure rather than through
+# legend-only traces; placed where the horizontal plotly legend used to sit
+# (paper x=0.71, y=0.83 inside the 60px top / 10px bottom / 25px side margins)
+LEGEND_HTML = (
+    '<div style="position:absolute; top:calc(60px + 0.17 * (100% - 70px)); '
+    'left:calc(25px + 0.71 * (100% - 50px)); transform:translateX(-50%); '
+    'font-family:sans-serif; font-size:12px; white-space:nowrap; pointer-events:none;">'
+    + ''.join(
+        '<span style="display:inline-flex; align-items:center; margin-right:12px;">'
+        f'<i style="display:inline-block; width:12px; height:12px; background:{color}; margin-right:4px;"></i>'
+        f'{category_name}</span>'
+        for category_name, color in COLOR_MAP.items()
+    )
+    + '</div>'
+)
+
+DASHBOARD_LAYOUT = dict(
+    title=dict(text="<b>Executive Sales Summary</b>", x=0.06, font=dict(size=24)),
+    barmode='overlay',
+    shapes=[
+        dict(type="rect", xref="paper", yref="paper", x0=-0.05, y0=0.90, x1=1.03, y1=1.01,
+             fillcolor="#f5f5f5", line=dict(width=0), layer="below"),
+    ],
+    coloraxis=dict(showscale=False),
+    margin=dict(t=60, l=25, r=25, b=10),
+    hoverlabel=dict(
+        bgcolor="white",
+        font=dict(size=16, family="Rockwell")
+    ),
+    showlegend=False,
+    paper_bgcolor='white',
+    plot_bgcolor='white'
+)
+
+# HTML skeleton the dashboard figure JSON is written into
+DASHBOARD_HTML_HEAD = (
+    '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8" />\n'
+    '<script src="https://cdn.plot.ly/plotly-{plotlyjs_version}.min.js" charset="utf-8"></script>\n'
+    '</head>\n<body>\n<div style="position:relative;">\n'
+    '<div id="dashboard" style="height:100vh; width:100%;"></div>\n{legend_html}\n</div>\n'
+    '<script>\nvar fig = '
+)
+DASHBOARD_HTML_TAIL = (
+    ';\nPlotly.newPlot("dashboard", fig.data, fig.layout, {responsive: true});\n'
+    '</script>\n</body>\n</html>\n'
+)
+
+
+def create_dashboard(force=False):
     # ==============================================================================
     # 1. DATA PREPARATION
     # ==============================================================================
     try:
-        script_dir = Path(__file__).resolve().parent
-        base_dir = script_dir.parent
+        script_file = Path(__file__).resolve()
+        base_dir = script_file.parent.parent
     except NameError:
+        script_file = None
         base_dir = Path('.')
 
     data_dir = base_dir / 'data'
     outputs_dir = base_dir / 'outputs'
     products_file = data_dir / 'products.csv'
     sales_file = data_dir / 'sales_summary.csv'
+    output_file_path = outputs_dir / 'executive_sales_summary.html'
+
+    # --- Reuse the last render if the inputs are unchanged ---
+    # The cache key is the mtime and size of both CSVs and of this script, plus the installed
+    # plotly version (read from package metadata so a cache hit never imports plotly);
+    # force=True (--force) rebuilds anyway.
+    cache_file = None
+    if products_file.exists() and sales_file.exists():
+        key_files = [products_file, sales_file] + ([script_file] if script_file is not None else [])
+        key_parts = [(st.st_mtime_ns, st.st_size) for st in map(Path.stat, key_files)]
+        key_parts.append(importlib.metadata.version('plotly'))
+        cache_key = hashlib.sha1(str(key_parts).encode()).hexdigest()[:16]
+        cache_file = outputs_dir / f'.cache_{cache_key}.html'
+        if cache_file.exists() and not force:
+            shutil.copyfile(cache_file, output_file_path)
+            print(f"Input data unchanged, reused cached dashboard:\n{output_file_path.resolve()}")
+            return
+
+    # Plotly's import graph is heavy, so only pay for it when a dashboard is built
+    import plotly.io as pio
+    from plotly.offline import get_plotlyjs_version
+    from plotly.subplots import make_subplots
 
     # --- Data for Treemap ---
     try:
-        df_products = pd.read_csv(products_file)
+        df_products = pd.read_csv(products_file, usecols=list(PRODUCT_DTYPES), dtype=PRODUCT_DTYPES, **CSV_READ_OPTIONS)
     except FileNotFoundError:
         print("Product CSV not found. Using dummy product data.")
         product_data = {
@@ -32,11 +167,29 @@ def create_dashboard():
                              'Shirts'],
             'value': [1500, 1200, 300, 500, 800, 200, 600, 150]
         }
-        df_products = pd.DataFrame(product_data)
+        df_products = pd.DataFrame(product_data).astype(PRODUCT_DTYPES)
+
+    # Collapse the treemap input to one row per subcategory, folding subcategories
+    # below 0.5% of the total into a per-category "Other" tile to bound the rect count.
+    # A category with a single small subcategory keeps it, since folding saves no tile there.
+    df_treemap = df_products.groupby(['category', 'sub_category'], as_index=False, sort=False, observed=True)['value'].sum()
+    small = df_treemap['value'] < df_treemap['value'].sum() * 0.005
+    small &= small.groupby(df_treemap['category'], observed=True).transform('sum') > 1
+    if small.any():
+        df_other = df_treemap.loc[small].groupby('category', as_index=False, sort=False, observed=True)['value'].sum()
+        df_other['sub_category'] = 'Other'
+        df_treemap = pd.concat([df_treemap.loc[~small], df_other], ignore_index=True)
 
     # --- Data for Geographical Map (USA) ---
     try:
-        df_sales = pd.read_csv(sales_file)
+        if HAS_PYARROW:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+            # Memory-map the sales history so Arrow parses it straight from the page cache
+            with pa.memory_map(str(sales_file), 'r') as source:
+                df_sales = pacsv.read_csv(source).to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            df_sales = pd.read_csv(sales_file, **CSV_READ_OPTIONS)
     except FileNotFoundError:
         print("Sales summary CSV not found. Using dummy sales data.")
         # NOTE: Added all required columns to the dummy data to prevent errors.
@@ -54,130 +207,123 @@ def create_dashboard():
         }
         df_sales = pd.DataFrame(sales_data)
 
-    df_geo = df_sales.groupby('state_usa')['total_sales'].sum().reset_index()
+    df_geo = df_sales.groupby('state_usa', sort=False, observed=True)['total_sales'].sum().reset_index()
 
     # --- Data for KPIs/Cards ---
     # Calculate an estimated order count to derive average order value
-    df_sales['order_count_est'] = df_sales['total_sales'] / df_sales['order_avg']
-    total_order_count = df_sales['order_count_est'].sum()
-    total_revenue = df_sales['total_sales'].sum()
-    total_cost = df_sales['total_cost'].sum()
+    total_order_count = float((df_sales['total_sales'].to_numpy() / df_sales['order_avg'].to_numpy()).sum())
+    # Sum all KPI source columns in a single reduction
+    kpi_sums = df_sales[['total_sales', 'total_cost', 'total_discount', 'units_sales']].sum()
+    total_revenue, total_cost, total_discount, total_units = kpi_sums.tolist()
 
     # Calculate high-level metrics
     total_profit = total_revenue - total_cost
-    total_discount = df_sales['total_discount'].sum()
     profit_margin = total_profit / total_revenue if total_revenue else 0
     avg_order_value = total_revenue / total_order_count if total_order_count else 0
-    total_units = df_sales['units_sales'].sum()
 
     # Product-specific KPIs
     num_products = len(df_products)
 
     # --- Data for Bar Chart (Monthly Promotional Sales Percentage) ---
-    df_bar = df_sales.copy()
     # Calculate promotional sales for each record
-    df_bar['promo_sales'] = df_bar['total_sales'] * df_bar['percentage_promo']
-    # Group by month and sum total sales and promo sales
-    monthly_summary = df_bar.groupby(['year', 'month']).agg(
-        total_sales=('total_sales', 'sum'),
-        promo_sales=('promo_sales', 'sum')
-    ).reset_index()
+    promo_sales = df_sales['total_sales'].to_numpy() * df_sales['percentage_promo'].to_numpy()
+    # Group by month and sum total sales and promo sales in one reduction, using a slim
+    # frame of just the needed columns instead of a full copy of df_sales
+    monthly_summary = pd.DataFrame({
+        'year': df_sales['year'].to_numpy(),
+        'month': df_sales['month'].to_numpy(),
+        'total_sales': df_sales['total_sales'].to_numpy(),
+        'promo_sales': promo_sales
+    }).groupby(['year', 'month'], as_index=False, sort=False).sum()
+    # The bar x-axis is chronological, so sort the (small) result once
+    monthly_summary = monthly_summary.sort_values(['year', 'month'], ignore_index=True)
     # Calculate the overall promotional percentage for the month
     monthly_summary['promo_percentage'] = (monthly_summary['promo_sales'] / monthly_summary['total_sales'])
 
     # Create a month-year label for the x-axis
-    month_map = {
-        1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr', 5: 'May', 6: 'Jun',
-        7: 'Jul', 8: 'Aug', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dec'
-    }
-    monthly_summary['month_name'] = monthly_summary['month'].map(month_map)
-    monthly_summary['month_year_label'] = monthly_summary['month_name'] + ' ' + monthly_summary['year'].astype(str)
+    month_names = MONTH_NAMES[monthly_summary['month'].to_numpy() - 1]
+    years = monthly_summary['year'].to_numpy().astype(str)
+    monthly_summary['month_year_label'] = np.char.add(np.char.add(month_names, ' '), years)
 
     # Add state abbreviations for the scatter_geo map
-    us_state_to_abbrev = {
-        "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
-        "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE", "Florida": "FL", "Georgia": "GA",
-        "Hawaii": "HI", "Idaho": "ID", "Illinois": "IL", "Indiana": "IN", "Iowa": "IA",
-        "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
-        "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS",
-        "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV", "New Hampshire": "NH",
-        "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY", "North Carolina": "NC",
-        "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK", "Oregon": "OR", "Pennsylvania": "PA",
-        "Rhode Island": "RI", "South Carolina": "SC", "South Dakota": "SD", "Tennessee": "TN",
-        "Texas": "TX", "Utah": "UT", "Vermont": "VT", "Virginia": "VA", "Washington": "WA",
-        "West Virginia": "WV", "Wisconsin": "WI", "Wyoming": "WY"
-    }
-    df_geo['state_code'] = df_geo['state_usa'].map(us_state_to_abbrev)
-
-    # Color map for the treemap categories
-    color_map = {
-        'Home Appliances': '#d8d8d8',
-        'Electronics': '#5a6d8b',
-        'Sports': '#66bfc7',
-        'Furniture': '#a14df2',
-        'Clothing': '#3333a6'
-    }
+    df_geo['state_code'] = df_geo['state_usa'].astype('string').map(STATE_ABBREV)
 
     # ==============================================================================
     # 2. CREATE INDIVIDUAL FIGURES
     # ==============================================================================
 
-    # --- Create Geographical Map Figure (USA) ---
-    fig_geo = px.scatter_geo(
-        df_geo,
-        locations='state_code',
+    # --- Create Geographical Map Trace (USA) ---
+    # Emitted directly rather than via px.scatter_geo; marker areas are scaled the
+    # way plotly express does it for its default size_max of 20 (sizeref = max / 20**2)
+    geo_sizes = df_geo['total_sales'].to_numpy(dtype='float64')
+    geo_trace = dict(
+        type='scattergeo',
+        geo='geo',
+        locations=df_geo['state_code'].to_numpy(dtype=object, na_value=None),
         locationmode="USA-states",
-        size='total_sales',
-        scope="usa",
-        custom_data=['state_usa', 'total_sales']
-    )
-    fig_geo.update_traces(
-        marker_color='#62738c',
-        hovertemplate='<b>%{customdata[0]}</b><br>Total Sales: %{customdata[1]:$,.2f}<extra></extra>'
-    )
-
-    # --- Create Bar Chart Figure (Monthly Promo %) ---
-    fig_bar = go.Figure()
-
-    fig_bar.add_trace(go.Bar(
-        x=monthly_summary['month_year_label'],
-        y=[1] * len(monthly_summary),
-        marker_color='lightgray',
-        hoverinfo='none',
-        showlegend=False
-    ))
-
-    fig_bar.add_trace(go.Bar(
-        x=monthly_summary['month_year_label'],
-        y=monthly_summary['promo_percentage'],
-        hovertemplate='Promotional Sales: %{y:.1%}<extra></extra>',
-        marker_color='#62738c',
+        marker=dict(
+            size=geo_sizes,
+            sizemode='area',
+            sizeref=geo_sizes.max() / (20 ** 2) if len(geo_sizes) else 1,
+            color='#62738c'
+        ),
+        customdata=[list(row) for row in zip(df_geo['state_usa'].tolist(), df_geo['total_sales'].tolist())],
+        hovertemplate='<b>%{customdata[0]}</b><br>Total Sales: %{customdata[1]:$,.2f}<extra></extra>',
         showlegend=False
-    ))
+    )
 
-    fig_bar.update_layout(showlegend=False)
+    # --- Create Bar Chart Traces (Monthly Promo %) ---
+    # Built as plain trace dicts, which skip graph_objects validation
+    month_labels = monthly_summary['month_year_label'].tolist()
+    bar_traces = [
+        dict(
+            type='bar',
+            x=month_labels,
+            y=[1] * len(monthly_summary),
+            marker=dict(color='lightgray'),
+            hoverinfo='none',
+            showlegend=False
+        ),
+        dict(
+            type='bar',
+            x=month_labels,
+            y=monthly_summary['promo_percentage'].tolist(),
+            hovertemplate='Promotional Sales: %{y:.1%}<extra></extra>',
+            marker=dict(color='#62738c'),
+            showlegend=False
+        )
+    ]
 
-    # --- Create Treemap Figure (Right side) ---
-    fig_treemap = px.treemap(
-        df_products,
-        path=['category', 'sub_category'],
-        values='value',
-        color='category',
-        color_discrete_map=color_map
+    # --- Create Treemap Trace (Right side) ---
+    # Roll the category -> subcategory hierarchy up in one pandas pass instead of
+    # letting px.treemap infer it; ids keep repeated labels such as "Other" distinct
+    cat_totals = df_treemap.groupby('category', sort=False, observed=True)['value'].sum()
+    treemap_categories = cat_totals.index.astype(str).tolist()
+    sub_parents = df_treemap['category'].astype(str).tolist()
+    sub_labels = df_treemap['sub_category'].astype(str).tolist()
+    treemap_trace = dict(
+        type='treemap',
+        ids=treemap_categories + [f'{cat}/{sub}' for cat, sub in zip(sub_parents, sub_labels)],
+        labels=treemap_categories + sub_labels,
+        parents=[''] * len(treemap_categories) + sub_parents,
+        values=cat_totals.tolist() + df_treemap['value'].tolist(),
+        marker=dict(
+            colors=[COLOR_MAP.get(cat) for cat in treemap_categories + sub_parents],
+            pad=dict(t=2, l=2, r=2, b=2)
+        ),
+        branchvalues='total',
+        textinfo='label+value+percent parent',
+        texttemplate="<b>%{label}</b><br>%{value}<br>%{percentParent:.1%}",
+        hovertemplate='<b>%{label}</b><br>Value:%{value}<br>Share of Parent: %{percentParent:.1%}<extra></extra>'
     )
-    for category_name, color in color_map.items():
-        fig_treemap.add_trace(go.Scatter(
-            x=[None], y=[None], mode='markers',
-            marker=dict(size=15, color=color, symbol='square'),
-            name=category_name, showlegend=True
-        ))
 
     # ==============================================================================
     # 3. COMBINE FIGURES INTO A SINGLE DASHBOARD
     # ==============================================================================
 
-    # Create a figure with subplots
-    fig_combined = make_subplots(
+    # Lay out the subplot grid once, then assemble the figure as a plain dict so
+    # traces and layout skip plotly's per-property validation
+    subplot_grid = make_subplots(
         rows=3, cols=2,
         specs=[[{'type': 'indicator', 'colspan': 2}, None],
                [{'type': 'scattergeo'}, {'type': 'treemap', 'rowspan': 2}],
@@ -187,6 +333,9 @@ def create_dashboard():
         vertical_spacing=0.15,
         horizontal_spacing=0.04
     )
+    fig_data = []
+    fig_layout = subplot_grid.to_dict()['layout']
+    treemap_domain = subplot_grid.get_subplot(2, 2)
 
     # --- Add Indicator (KPI) Traces ---
     indicators_data = [
@@ -209,7 +358,11 @@ def create_dashboard():
     card_width = (1.0 - x_start * 2 - total_gap_space) / num_cards
     all_annotations = []
 
-    for ind,i in zip(indicators_data, range(len(indicators_data))):
+    # Left edge of every card: each advances by card_width + gap, with an extra 0.02
+    # of spacing after the second and third cards
+    card_x0 = [x_start + i * (card_width + gap) + 0.02 * min(max(i - 1, 0), 2) for i in range(num_cards)]
+
+    for ind, x0 in zip(indicators_data, card_x0):
         if 'text' in ind:
             # For the text-only card, we use an annotation positioned in the first slot.
             kpi_annotation = dict(
@@ -217,7 +370,7 @@ def create_dashboard():
                 align='left',
                 showarrow=False,
                 xref='paper', yref='paper',
-                x=x_start + 0.01, y=1,
+                x=x0 + 0.01, y=1,
                 xanchor='left', yanchor='top',
                 font=dict(size=20, color="black")
             )
@@ -230,125 +383,57 @@ def create_dashboard():
                 'valueformat': ind.get('valueformat', ',.0f'),
                 'font': {"size": 20, "color": "black"}
             }
-            if(x_start + card_width > 1.0):
-                card_width = 1.0 - x_start
-            fig_combined.add_trace(go.Indicator(
+            fig_data.append(dict(
+                type='indicator',
                 mode="number",
                 value=ind['value'],
                 number=number_config,
-                domain={'row': 0, 'column': 0, 'x': [x_start, x_start + card_width], 'y': [0.95, 1]}
+                domain={'row': 0, 'column': 0, 'x': [x0, min(x0 + card_width, 1.0)], 'y': [0.95, 1]}
             ))
-        # Increment the horizontal position for the next card
-        if(i in [1,2]):
-            x_start += (card_width + gap) + 0.02
-        else:
-            x_start += card_width + gap
-
-
-    for trace in fig_geo.data:
-        fig_combined.add_trace(trace, row=2, col=1)
 
+    # Geo and bar traces keep their default 'geo' and 'x'/'y' subplot references
+    fig_data.append(geo_trace)
+    fig_data.extend(bar_traces)
 
-    for trace in fig_bar.data:
-        fig_combined.add_trace(trace, row=3, col=1)
-
-    # Add treemap and legend traces
-    for trace in fig_treemap.data:
-        if trace.type == 'treemap':
-            fig_combined.add_trace(trace, row=2, col=2)
-        elif trace.type == 'scatter':
-            fig_combined.add_trace(trace)
+    # Add treemap trace
+    treemap_trace['domain'] = dict(x=list(treemap_domain.x), y=list(treemap_domain.y))
+    fig_data.append(treemap_trace)
 
     # ==============================================================================
     # 4. UPDATE LAYOUT AND STYLING
     # ==============================================================================
 
-    treemap_trace_index = -1
-    for i, trace in enumerate(fig_combined.data):
-        if trace.type == 'treemap':
-            treemap_trace_index = i
-            break
-
-    if treemap_trace_index != -1:
-        fig_combined.data[treemap_trace_index].textinfo = 'label+value+percent parent'
-        fig_combined.data[treemap_trace_index].texttemplate = "<b>%{label}</b><br>%{value}<br>%{percentParent:.1%}"
-        fig_combined.data[
-            treemap_trace_index].hovertemplate = '<b>%{label}</b><br>Value:%{value}<br>Share of Parent: %{percentParent:.1%}<extra></extra>'
-        fig_combined.data[treemap_trace_index].marker.pad = dict(t=2, l=2, r=2, b=2)
+    all_annotations.extend(CHART_TITLE_ANNOTATIONS)
 
-    chart_title_annotations = [
-        dict(
-            text="Map of Sales",
-            y=0.84, x=0.055,  # Centered over the first column
-            xref='paper', yref='paper',
-            font=dict(size=16), showarrow=False, xanchor='center', yanchor='bottom'
-        ),
-        dict(
-            text="Net Revenue by Subcategory",
-            y=0.84, x=0.61,  # Centered over the second column
-            xref='paper', yref='paper',
-            font=dict(size=16), showarrow=False, xanchor='center', yanchor='bottom'
-        ),
-        dict(
-            text="% Net Revenue - <b>Promo</b> vs <b style='color:#62738c'>Non-Promo</b>",
-            y=0.28, x=0.13,  # Centered over the first column
-            xref='paper', yref='paper',
-            font=dict(size=16), showarrow=False, xanchor='center', yanchor='bottom'
-        )
-    ]
-    all_annotations.extend(chart_title_annotations)
-
-    fig_combined.update_layout(
-        title_text="<b>Executive Sales Summary</b>",
-        title_x=0.06,
-        title_font_size=24,
-        barmode='overlay',
-        shapes=[
-            dict(type="rect", xref="paper", yref="paper", x0=-0.05, y0=0.90, x1=1.03, y1=1.01,
-                 fillcolor="#f5f5f5", line_width=0, layer="below"),
-        ],
-        annotations=all_annotations,
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=0.83,
-            xanchor="center",
-            x=0.71
-        ),
-        coloraxis_showscale=False,
-        margin=dict(t=60, l=25, r=25, b=10),
-        hoverlabel=dict(
-            bgcolor="white",
-            font_size=16,
-            font_family="Rockwell"
-        ),
-        xaxis_visible=False,
-        yaxis_visible=False,
-        paper_bgcolor='white',
-        plot_bgcolor='white'
-    )
+    fig_layout.update(annotations=all_annotations, **DASHBOARD_LAYOUT)
 
-    fig_combined.update_geos(
+    fig_layout['geo'].update(
         scope='usa',
         landcolor='#d6d6d6',
-        row=2, col=1,
         bgcolor='rgba(0,0,0,0)'
     )
 
-    fig_combined.update_xaxes(title_text="", visible=True, tickangle=-90, row=3, col=1)
-    fig_combined.update_yaxes(
-        title_text="% of Total Net Revenue",
+    fig_layout['xaxis'].update(title=dict(text=""), visible=True, tickangle=-90)
+    fig_layout['yaxis'].update(
+        title=dict(text="% of Total Net Revenue"),
         tickformat=".0%",
-        visible=True,
-        row=3,
-        col=1
+        visible=True
     )
 
     outputs_dir.mkdir(parents=True, exist_ok=True)
-    output_file_path = outputs_dir / 'executive_sales_summary.html'
-    fig_combined.write_html(output_file_path)
+    # Stream a small HTML skeleton around the figure JSON instead of building the whole
+    # page as one string; plotly.js is referenced from the CDN rather than inlined.
+    fig_json = pio.to_json({'data': fig_data, 'layout': fig_layout}, validate=False)
+    with open(output_file_path, 'w', encoding='utf-8') as f:
+        f.write(DASHBOARD_HTML_HEAD.format(plotlyjs_version=get_plotlyjs_version(), legend_html=LEGEND_HTML))
+        f.write(fig_json)
+        f.write(DASHBOARD_HTML_TAIL)
+    if cache_file is not None:
+        for stale_cache in outputs_dir.glob('.cache_*.html'):
+            stale_cache.unlink()
+        shutil.copyfile(output_file_path, cache_file)
     print(f"Dashboard successfully saved to:\n{output_file_path.resolve()}")
 
 
 if __name__ == "__main__":
-    create_dashboard()
\ No newline at end of file
+    create_dashboard(force='--force' in sys.argv[1:])
\ No newline at end of file